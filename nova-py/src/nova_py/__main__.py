@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 import logging
+import shutil
 from argparse import ArgumentParser, ArgumentTypeError
 from pathlib import Path
 from typing import TYPE_CHECKING, Final
 
+from .archive import ARCHIVE_INDEX_NAME, ArchiveIndex, VisitorStatus
 from .audio.controller import AudacityController
 from .cli.args import LOG_FORMAT, NOVACLIArgs, loglevel
+from .jobs import (
+    DEFAULT_JOB_TIMEOUT,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_RETRY_DELAY,
+    JOB_OUTPUT_DIR_NAME,
+    JobQueue,
+    JobWorker,
+)
 from .scenario import Scenario
-from .utils import get_input_path, raise_error
+from .utils import check_dir_path, get_input_path, raise_error, scan_input_dir, set_error_dialogs
 from .visual.image import VisualController
+from .visual.preview import serve_previews
 
 if TYPE_CHECKING:
     from argparse import Namespace
 
+    from .jobs import Job
+    from .utils import InputFiles
+
 
 _LOGGER: Final = logging.getLogger(__name__)
 
@@ -34,16 +50,93 @@ def main() -> None:
 def exec_process(args: Namespace) -> None:
     input_dir: Path = args.input.resolve() if args.input is not None else get_input_path()
     scenario = args.scenario
+    if args.archive_index is None:
+        process_visitor(input_dir=input_dir, scenario=scenario)
+        return
+
+    with ArchiveIndex(db_path=args.archive_index) as index:
+        index.set_status(visitor_dir=input_dir, status=VisitorStatus.PROCESSING)
+        try:
+            process_visitor(input_dir=input_dir, scenario=scenario)
+        except Exception:
+            index.set_status(visitor_dir=input_dir, status=VisitorStatus.FAILED)
+            raise
+        index.set_status(visitor_dir=input_dir, status=VisitorStatus.DONE)
+
+
+def exec_archive(args: Namespace) -> None:
+    archive_dir: Path = args.archive_dir.resolve()
+    db_path: Path = args.index if args.index is not None else archive_dir / ARCHIVE_INDEX_NAME
+    with ArchiveIndex(db_path=db_path) as index:
+        index.sync(archive_dir=archive_dir)
+        for visitor in index.visitors(status=args.status):
+            print(f'{visitor.status}\t{visitor.path}')
+
+
+def exec_enqueue(args: Namespace) -> None:
+    input_dir: Path = args.input.resolve() if args.input is not None else get_input_path()
+    check_dir_path(input_dir)
+    job_id = JobQueue(db_path=args.queue).enqueue(scenario=args.scenario, input_dir=input_dir, output_dir=args.output)
+    print(job_id)
+
+
+def exec_worker(args: Namespace) -> None:
+    # nobody is there to dismiss an error dialog on a render node
+    set_error_dialogs(False)
+    queue = JobQueue(
+        db_path=args.queue, lease_seconds=args.lease, max_attempts=args.max_attempts, retry_delay=args.retry_delay
+    )
+    worker = JobWorker(
+        queue=queue,
+        process=process_job,
+        worker_id=args.worker_id,
+        poll_interval=args.poll_interval,
+        job_timeout=args.job_timeout,
+    )
+    worker.run(max_jobs=args.max_jobs)
+
+
+def exec_queue_status(args: Namespace) -> None:
+    stats = JobQueue(db_path=args.queue).stats()
+    print(f'depth: {stats.depth}')
+    print(f'pending: {stats.pending}')
+    print(f'running: {stats.running}')
+    print(f'done: {stats.done}')
+    print(f'failed: {stats.failed}')
+    print(f'active workers: {stats.active_workers}')
+    if stats.avg_duration is not None:
+        print(f'average job duration: {stats.avg_duration:.1f}s')
+    if stats.estimated_wait is not None:
+        print(f'estimated wait: {stats.estimated_wait:.1f}s')
+
+
+def exec_previews(args: Namespace) -> None:
+    archive_dir: Path = args.archive_dir.resolve()
+    check_dir_path(archive_dir)
+    serve_previews(archive_dir=archive_dir, host=args.host, port=args.port)
+
+
+def process_job(job: Job) -> None:
+    process_visitor(input_dir=job.input_dir, scenario=job.scenario)
+    job.output_dir.mkdir(parents=True, exist_ok=True)
+    for output_file in job.scenario.output_files:
+        shutil.copy2(output_file, job.output_dir / output_file.name)
+    _LOGGER.info(f'Copied the results of job {job.id} to {job.output_dir}.')
+
+
+def process_visitor(input_dir: Path, scenario: Scenario) -> None:
+    check_dir_path(input_dir)
+    input_files = scan_input_dir(input_dir)
     if scenario.value['has_audio']:
-        audio_processing(input_dir=input_dir, scenario=args.scenario)
+        audio_processing(input_dir=input_dir, input_files=input_files, scenario=scenario)
     if scenario.value['has_visual']:
-        visual_processing(input_dir=input_dir, scenario=args.scenario)
+        visual_processing(input_dir=input_dir, input_files=input_files, scenario=scenario)
 
 
-def audio_processing(input_dir: Path, scenario: Scenario) -> None:
+def audio_processing(input_dir: Path, input_files: InputFiles, scenario: Scenario) -> None:
     audioController = AudacityController()
     audioController.start_audacity()
-    audioController.import_audio_batch(input_dir=input_dir)
+    audioController.import_audio_batch(input_dir=input_dir, input_files=input_files)
     audio_map = scenario.value['audio_map']
     for track_id in audio_map.keys():
         audioController.move_audio_clip(track=track_id, destinations=audio_map[track_id], duration=15)
@@ -52,14 +145,14 @@ def audio_processing(input_dir: Path, scenario: Scenario) -> None:
     audioController.select_tracks(track=0, count=1)
     audioController.add_delay()
     audioController.select(start=0, end=600, track=0, count=audioController._total_tracks)
-    audioController.export_audio()
+    audioController.export_audio(output_path=scenario.value['audio_output'])
     audioController.remove_tracks()
     audioController.stop_audacity()
 
 
-def visual_processing(input_dir: Path, scenario: Scenario) -> None:
+def visual_processing(input_dir: Path, input_files: InputFiles, scenario: Scenario) -> None:
     visualController = VisualController()
-    visualController.read_files(input_dir=input_dir, expected=len(scenario.value['img_names']))
+    visualController.read_files(input_dir=input_dir, expected=len(scenario.value['img_names']), input_files=input_files)
     visualController.process_files(img_names=scenario.value['img_names'], output_dir=scenario.value['output'])
 
 
@@ -92,6 +185,93 @@ def _create_argument_parser() -> ArgumentParser:
     )
 
     main_parser.add_argument('--input', type=Path, help='[Optional] Path to the input files.')
+    main_parser.add_argument(
+        '--archive-index', type=Path, help='[Optional] Archive index in which to record the processing status.'
+    )
+
+    archive_parser = nova_py_args_command.add_parser(
+        'archive',
+        help='Index the visitor archive and list visitor folders.',
+        parents=[nova_cli_args.logging_args],
+    )
+    archive_parser.add_argument('archive_dir', type=Path, help='Path to the directory holding the visitor folders.')
+    archive_parser.add_argument(
+        '--index',
+        type=Path,
+        help=f'[Optional] Path to the index database. Default: <archive_dir>/{ARCHIVE_INDEX_NAME}.',
+    )
+    archive_parser.add_argument(
+        '--status',
+        type=VisitorStatus,
+        choices=list(VisitorStatus),
+        help='[Optional] Only list visitors with the given processing status.',
+    )
+
+    queue_args = ArgumentParser(add_help=False)
+    queue_args.add_argument('--queue', type=Path, required=True, help='Path to the job queue database.')
+
+    enqueue_parser = nova_py_args_command.add_parser(
+        'enqueue',
+        help='Add a visitor to the job queue for processing by a worker.',
+        parents=[nova_cli_args.logging_args, queue_args],
+    )
+    enqueue_parser.add_argument(
+        '--scenario',
+        type=scenario_type,
+        choices=list(Scenario),
+        required=True,
+        help='The scenario to process.',
+    )
+    enqueue_parser.add_argument('--input', type=Path, help='[Optional] Path to the input files.')
+    enqueue_parser.add_argument(
+        '--output',
+        type=Path,
+        help=f'[Optional] Directory to copy the results to. Default: <input>/{JOB_OUTPUT_DIR_NAME}.',
+    )
+
+    worker_parser = nova_py_args_command.add_parser(
+        'worker',
+        help='Process visitors from the job queue.',
+        parents=[nova_cli_args.logging_args, queue_args],
+    )
+    worker_parser.add_argument('--worker-id', help='[Optional] Worker name. Default: <hostname>-<pid>.')
+    worker_parser.add_argument(
+        '--lease', type=int, default=DEFAULT_LEASE_SECONDS, help='Seconds a claimed job is held without heartbeat.'
+    )
+    worker_parser.add_argument(
+        '--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS, help='Attempts before a job is marked failed.'
+    )
+    worker_parser.add_argument(
+        '--retry-delay',
+        type=float,
+        default=DEFAULT_RETRY_DELAY,
+        help='Seconds per attempt before a failed job is retried.',
+    )
+    worker_parser.add_argument(
+        '--job-timeout',
+        type=float,
+        default=DEFAULT_JOB_TIMEOUT,
+        help='Seconds a job may run before it is marked failed.',
+    )
+    worker_parser.add_argument(
+        '--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, help='Seconds to wait when the queue is empty.'
+    )
+    worker_parser.add_argument('--max-jobs', type=int, help='[Optional] Exit after processing this many jobs.')
+
+    nova_py_args_command.add_parser(
+        'queue-status',
+        help='Show the job queue depth and throughput.',
+        parents=[nova_cli_args.logging_args, queue_args],
+    )
+
+    previews_parser = nova_py_args_command.add_parser(
+        'previews',
+        help='Serve the image previews of the visitor folders for operator review.',
+        parents=[nova_cli_args.logging_args],
+    )
+    previews_parser.add_argument('archive_dir', type=Path, help='Path to the directory holding the visitor folders.')
+    previews_parser.add_argument('--host', default='127.0.0.1', help='Address to listen on. Default: 127.0.0.1.')
+    previews_parser.add_argument('--port', type=int, default=8000, help='Port to listen on. Default: 8000.')
     return nova_py_args
 
 
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from .utils import AUDIO_EXTENSIONS, IMG_EXTENSIONS, VIDEO_EXTENSIONS, check_dir_path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+ARCHIVE_INDEX_NAME: Final = 'nova_archive.sqlite3'
+ARCHIVE_INDEX_TIMEOUT: Final = 30
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS visitors (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    visitor_path TEXT NOT NULL REFERENCES visitors(path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (visitor_path, name)
+);
+CREATE INDEX IF NOT EXISTS visitors_status ON visitors(status);
+"""
+
+
+class FileKind(Enum):
+    IMAGE = 'image'
+    AUDIO = 'audio'
+    VIDEO = 'video'
+
+    @staticmethod
+    def from_name(name: str) -> FileKind | None:
+        ext = os.path.splitext(name)[1].lower()
+        if ext in IMG_EXTENSIONS:
+            return FileKind.IMAGE
+        if ext in AUDIO_EXTENSIONS:
+            return FileKind.AUDIO
+        if ext in VIDEO_EXTENSIONS:
+            return FileKind.VIDEO
+        return None
+
+
+class VisitorStatus(Enum):
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass(frozen=True)
+class VisitorEntry:
+    path: Path
+    status: VisitorStatus
+    updated_at: float
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: Path
+    kind: FileKind
+    size: int
+    mtime_ns: int
+
+
+class ArchiveIndex:
+    """Persistent SQLite index of the visitor folders in the archive.
+
+    Each visitor folder is rescanned only when its modification time changes, so syncing a large
+    archive costs one ``stat`` per folder instead of a full directory walk. A visitor whose media
+    files changed goes back to ``pending``.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=ARCHIVE_INDEX_TIMEOUT)
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> ArchiveIndex:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def sync(self, archive_dir: Path) -> int:
+        """Refresh the index from ``archive_dir`` and return the number of rescanned visitor folders."""
+        check_dir_path(archive_dir)
+        archive_dir = archive_dir.resolve()
+        _LOGGER.info(f'Syncing archive index {self._db_path} with {archive_dir}.')
+        known = {
+            path: mtime_ns
+            for path, mtime_ns in self._conn.execute('SELECT path, mtime_ns FROM visitors')
+            if Path(path).parent == archive_dir
+        }
+        seen: set[str] = set()
+        rescanned = 0
+        with self._conn, os.scandir(archive_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                seen.add(entry.path)
+                mtime_ns = entry.stat().st_mtime_ns
+                if known.get(entry.path) == mtime_ns:
+                    continue
+                self._index_visitor(visitor_path=entry.path, mtime_ns=mtime_ns)
+                rescanned += 1
+            removed = [(path,) for path in known if path not in seen]
+            self._conn.executemany('DELETE FROM visitors WHERE path = ?', removed)
+        _LOGGER.debug(f'Rescanned {rescanned} visitor folders, removed {len(removed)}.')
+        return rescanned
+
+    def _index_visitor(self, visitor_path: str, mtime_ns: int, status: VisitorStatus = VisitorStatus.PENDING) -> None:
+        files = []
+        with os.scandir(visitor_path) as entries:
+            for entry in entries:
+                kind = FileKind.from_name(entry.name)
+                if kind is None or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files.append((visitor_path, entry.name, kind.value, stat.st_size, stat.st_mtime_ns))
+        indexed = self._conn.execute('SELECT * FROM files WHERE visitor_path = ?', (visitor_path,)).fetchall()
+        if sorted(indexed) == sorted(files):
+            # only output folders such as the previews changed, the visitor's media is unchanged
+            cursor = self._conn.execute('UPDATE visitors SET mtime_ns = ? WHERE path = ?', (mtime_ns, visitor_path))
+            if cursor.rowcount:
+                return
+        self._conn.execute(
+            """
+            INSERT INTO visitors (path, mtime_ns, status, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                mtime_ns = excluded.mtime_ns, status = excluded.status, updated_at = excluded.updated_at
+            """,
+            (visitor_path, mtime_ns, status.value, time.time()),
+        )
+        self._conn.execute('DELETE FROM files WHERE visitor_path = ?', (visitor_path,))
+        self._conn.executemany('INSERT INTO files VALUES (?, ?, ?, ?, ?)', files)
+
+    def set_status(self, visitor_dir: Path, status: VisitorStatus) -> None:
+        visitor_path = str(visitor_dir.resolve())
+        with self._conn:
+            cursor = self._conn.execute(
+                'UPDATE visitors SET status = ?, updated_at = ? WHERE path = ?',
+                (status.value, time.time(), visitor_path),
+            )
+            if cursor.rowcount == 0 and visitor_dir.is_dir():
+                # index the folder now, so the next sync does not take its media for new files
+                self._index_visitor(
+                    visitor_path=visitor_path, mtime_ns=os.stat(visitor_path).st_mtime_ns, status=status
+                )
+            elif cursor.rowcount == 0:
+                self._conn.execute(
+                    'INSERT INTO visitors (path, mtime_ns, status, updated_at) VALUES (?, ?, ?, ?)',
+                    (visitor_path, 0, status.value, time.time()),
+                )
+
+    def visitors(self, status: VisitorStatus | None = None) -> Iterator[VisitorEntry]:
+        query = 'SELECT path, status, updated_at FROM visitors'
+        params: tuple[str, ...] = ()
+        if status is not None:
+            query += ' WHERE status = ?'
+            params = (status.value,)
+        for path, status_value, updated_at in self._conn.execute(query + ' ORDER BY path', params):
+            yield VisitorEntry(path=Path(path), status=VisitorStatus(status_value), updated_at=updated_at)
+
+    def files(self, visitor_dir: Path, kind: FileKind | None = None) -> list[FileEntry]:
+        query = 'SELECT name, kind, size, mtime_ns FROM files WHERE visitor_path = ?'
+        params: tuple[str, ...] = (str(visitor_dir.resolve()),)
+        if kind is not None:
+            query += ' AND kind = ?'
+            params += (kind.value,)
+        return [
+            FileEntry(path=visitor_dir / name, kind=FileKind(kind_value), size=size, mtime_ns=mtime_ns)
+            for name, kind_value, size, mtime_ns in self._conn.execute(query + ' ORDER BY name', params)
+        ]
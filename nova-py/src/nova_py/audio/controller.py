@@ -7,11 +7,11 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Final, List
 
-from ..utils import OSName, check_dir_path, get_files_by_extension, get_process, raise_error
+from ..utils import OSName, check_dir_path, get_process, raise_error, scan_input_dir
 from .pipeclient import PipeClient
 
 if TYPE_CHECKING:
-    pass
+    from ..utils import InputFiles
 
 _LOGGER: Final = logging.getLogger(__name__)
 AUDACITY_WAIT_TIME: Final = 3
@@ -47,10 +47,11 @@ class AudacityController:
         self._total_tracks += 1
         return self._total_tracks - 1
 
-    def import_audio_batch(self, input_dir: Path) -> None:
+    def import_audio_batch(self, input_dir: Path, input_files: InputFiles | None = None) -> None:
         check_dir_path(input_dir)
-        wav_files = get_files_by_extension(input_dir=input_dir, accepted_extensions=['.m4a', '.mp3'])
-        for file_path in wav_files:
+        if input_files is None:
+            input_files = scan_input_dir(input_dir)
+        for file_path in input_files.audio:
             self.import_audio(input_path=file_path)
 
     def move_audio_clip(self, track: int, destinations: list[int], duration: int) -> None:
@@ -96,9 +97,9 @@ class AudacityController:
     def delete_audio(self) -> None:
         self.do_command(command='Delete')
 
-    def export_audio(self) -> None:
-        export_command = 'Export2: Filename="D:/NOVA/Have you seen my body/voices.aiff"'
-        self.do_command(command=export_command)
+    def export_audio(self, output_path: Path) -> None:
+        p = str(output_path).replace('\\', '/')
+        self.do_command(command=f'Export2: Filename="{p}"')
         time.sleep(5)
 
     def add_reverb_vocal1(self) -> None:
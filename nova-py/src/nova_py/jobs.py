@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from .scenario import Scenario
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS: Final = 120
+DEFAULT_MAX_ATTEMPTS: Final = 3
+DEFAULT_POLL_INTERVAL: Final = 5.0
+DEFAULT_RETRY_DELAY: Final = 30.0
+DEFAULT_JOB_TIMEOUT: Final = 1800.0
+JOB_OUTPUT_DIR_NAME: Final = 'output'
+
+_SCHEMA: Final = (
+    """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario TEXT NOT NULL,
+    input_dir TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL,
+    worker TEXT,
+    node TEXT,
+    lease_expires REAL,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+""",
+    'CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, id)',
+)
+
+
+class JobState(Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    scenario: Scenario
+    input_dir: Path
+    output_dir: Path
+    attempts: int
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    depth: int
+    pending: int
+    running: int
+    done: int
+    failed: int
+    active_workers: int
+    avg_duration: float | None
+
+    @property
+    def estimated_wait(self) -> float | None:
+        """Seconds until the current backlog drains at the observed throughput, if it can be estimated."""
+        if self.avg_duration is None or self.active_workers == 0:
+            return None
+        return self.depth * self.avg_duration / self.active_workers
+
+
+class JobQueue:
+    """Visitor processing queue stored in a SQLite database.
+
+    The database may live on storage shared by several booth and render machines. Workers claim jobs
+    under a lease which they renew with heartbeats; a job whose lease expires is handed to another
+    worker until it runs out of attempts. A failed job waits ``retry_delay`` seconds per attempt
+    before it can be claimed again.
+
+    Processing writes to the scenario's composition folder and drives the node's single Audacity
+    instance, so a node runs one job at a time: a worker does not claim while another worker on
+    the same node holds a live lease. Results are copied to the job's ``output_dir``.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ) -> None:
+        self._db_path = db_path
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        with self._transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @property
+    def lease_seconds(self) -> int:
+        return self._lease_seconds
+
+    @contextmanager
+    def _transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps the queue usable from heartbeat threads and
+        # avoids holding file locks on shared storage between calls. Reads use a deferred transaction,
+        # which only takes the shared lock, so monitoring does not hold up claims and heartbeats.
+        with closing(sqlite3.connect(self._db_path, timeout=30, isolation_level=None)) as conn:
+            conn.execute('BEGIN IMMEDIATE' if write else 'BEGIN DEFERRED')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def enqueue(self, scenario: Scenario, input_dir: Path, output_dir: Path | None = None) -> int:
+        input_dir = input_dir.resolve()
+        output_dir = output_dir.resolve() if output_dir is not None else input_dir / JOB_OUTPUT_DIR_NAME
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO jobs (scenario, input_dir, output_dir, state, enqueued_at) VALUES (?, ?, ?, ?, ?)',
+                (str(scenario), str(input_dir), str(output_dir), JobState.PENDING.value, time.time()),
+            )
+        job_id = cursor.lastrowid
+        assert job_id is not None
+        _LOGGER.info(f'Enqueued job {job_id}: {scenario} {input_dir}')
+        return job_id
+
+    def claim(self, worker_id: str, node: str) -> Job | None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE jobs SET state = ?, worker = NULL, error = ? WHERE state = ? AND lease_expires < ? AND attempts >= ?',
+                (JobState.FAILED.value, 'Lease expired', JobState.RUNNING.value, now, self._max_attempts),
+            )
+            busy = conn.execute(
+                'SELECT 1 FROM jobs WHERE state = ? AND node = ? AND worker != ? AND lease_expires >= ? LIMIT 1',
+                (JobState.RUNNING.value, node, worker_id, now),
+            ).fetchone()
+            if busy is not None:
+                _LOGGER.debug(f'Node {node} is busy with another worker.')
+                return None
+            row = conn.execute(
+                """
+                SELECT id, scenario, input_dir, output_dir, attempts FROM jobs
+                WHERE (state = ? AND (not_before IS NULL OR not_before <= ?)) OR (state = ? AND lease_expires < ?)
+                ORDER BY id LIMIT 1
+                """,
+                (JobState.PENDING.value, now, JobState.RUNNING.value, now),
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, scenario, input_dir, output_dir, attempts = row
+            conn.execute(
+                """
+                UPDATE jobs SET state = ?, worker = ?, node = ?, attempts = ?, lease_expires = ?, started_at = ?
+                WHERE id = ?
+                """,
+                (JobState.RUNNING.value, worker_id, node, attempts + 1, now + self._lease_seconds, now, job_id),
+            )
+        _LOGGER.info(f'Worker {worker_id} claimed job {job_id} (attempt {attempts + 1}).')
+        return Job(
+            id=job_id,
+            scenario=Scenario[scenario.upper()],
+            input_dir=Path(input_dir),
+            output_dir=Path(output_dir),
+            attempts=attempts + 1,
+        )
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Renew the lease of a running job. Returns ``False`` if the worker no longer holds the job."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND state = ?',
+                (time.time() + self._lease_seconds, job_id, worker_id, JobState.RUNNING.value),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE jobs SET state = ?, error = NULL, finished_at = ? WHERE id = ? AND worker = ? AND state = ?',
+                (JobState.DONE.value, time.time(), job_id, worker_id, JobState.RUNNING.value),
+            )
+        _LOGGER.info(f'Worker {worker_id} completed job {job_id}.')
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                    not_before = ? + ? * attempts, worker = NULL, lease_expires = NULL, error = ?, finished_at = ?
+                WHERE id = ? AND worker = ? AND state = ?
+                """,
+                (
+                    self._max_attempts,
+                    JobState.FAILED.value,
+                    JobState.PENDING.value,
+                    now,
+                    self._retry_delay,
+                    error,
+                    now,
+                    job_id,
+                    worker_id,
+                    JobState.RUNNING.value,
+                ),
+            )
+        _LOGGER.warning(f'Worker {worker_id} failed job {job_id}: {error}')
+
+    def stats(self) -> QueueStats:
+        now = time.time()
+        with self._transaction(write=False) as conn:
+            counts = dict(conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+            (depth,) = conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?)',
+                (JobState.PENDING.value, JobState.RUNNING.value, now),
+            ).fetchone()
+            (active_workers,) = conn.execute(
+                'SELECT COUNT(DISTINCT worker) FROM jobs WHERE state = ? AND lease_expires >= ?',
+                (JobState.RUNNING.value, now),
+            ).fetchone()
+            (avg_duration,) = conn.execute(
+                'SELECT AVG(finished_at - started_at) FROM (SELECT * FROM jobs WHERE state = ? ORDER BY id DESC LIMIT 50)',
+                (JobState.DONE.value,),
+            ).fetchone()
+        return QueueStats(
+            depth=depth,
+            pending=counts.get(JobState.PENDING.value, 0),
+            running=counts.get(JobState.RUNNING.value, 0),
+            done=counts.get(JobState.DONE.value, 0),
+            failed=counts.get(JobState.FAILED.value, 0),
+            active_workers=active_workers,
+            avg_duration=avg_duration,
+        )
+
+
+class JobWorker:
+    """Claim jobs from a queue and process them one at a time.
+
+    A job that runs longer than ``job_timeout`` seconds stops renewing its lease and is marked failed,
+    so that it is retried or given up on instead of holding the queue forever. The processing itself
+    cannot be interrupted: its result is discarded when it eventually returns.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        process: Callable[[Job], None],
+        worker_id: str | None = None,
+        node: str | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        job_timeout: float | None = DEFAULT_JOB_TIMEOUT,
+    ) -> None:
+        self._queue = queue
+        self._process = process
+        self._node = node if node is not None else socket.gethostname()
+        self._worker_id = worker_id if worker_id is not None else f'{self._node}-{os.getpid()}'
+        self._poll_interval = poll_interval
+        self._job_timeout = job_timeout
+
+    def run(self, max_jobs: int | None = None) -> int:
+        """Claim and process jobs until ``max_jobs`` are handled, or forever. Returns the number of handled jobs."""
+        _LOGGER.info(f'Worker {self._worker_id} started.')
+        handled = 0
+        while max_jobs is None or handled < max_jobs:
+            job = self._queue.claim(worker_id=self._worker_id, node=self._node)
+            if job is None:
+                time.sleep(self._poll_interval)
+                continue
+            self.run_job(job)
+            handled += 1
+        return handled
+
+    def run_job(self, job: Job) -> None:
+        stop = threading.Event()
+        timed_out = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job.id, stop, timed_out), daemon=True)
+        heartbeat.start()
+        error = None
+        try:
+            self._process(job)
+        except Exception as err:
+            error = f'{type(err).__name__}: {err}'
+        finally:
+            stop.set()
+            heartbeat.join()
+        if timed_out.is_set():
+            _LOGGER.warning(f'Worker {self._worker_id} discarded the result of job {job.id}, which timed out.')
+        elif error is not None:
+            self._queue.fail(job_id=job.id, worker_id=self._worker_id, error=error)
+        else:
+            self._queue.complete(job_id=job.id, worker_id=self._worker_id)
+
+    def _heartbeat(self, job_id: int, stop: threading.Event, timed_out: threading.Event) -> None:
+        interval = self._queue.lease_seconds / 3
+        deadline = time.monotonic() + self._job_timeout if self._job_timeout is not None else math.inf
+        while not stop.wait(min(interval, max(deadline - time.monotonic(), 0))):
+            try:
+                if time.monotonic() >= deadline:
+                    # stop renewing the lease and let the job be retried, or given up on at its last attempt
+                    timed_out.set()
+                    self._queue.fail(
+                        job_id=job_id, worker_id=self._worker_id, error=f'Timed out after {self._job_timeout:g}s'
+                    )
+                    return
+                if not self._queue.heartbeat(job_id=job_id, worker_id=self._worker_id):
+                    _LOGGER.warning(f'Worker {self._worker_id} lost the lease on job {job_id}.')
+                    return
+            except sqlite3.Error as err:
+                _LOGGER.warning(f'Heartbeat for job {job_id} failed: {err}')
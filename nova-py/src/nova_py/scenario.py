@@ -14,6 +14,8 @@ if TYPE_CHECKING:
 BASE_DIR: Final[Path] = (
     Path('D:\\NOVA\\') if platform.system() == OSName.WINDOWS.value else Path('/Users/dev/nova-tehnical/')
 )
+AUDIO_EXPORT_NAME: Final = 'voices.aiff'
+
 SEASCAPE_COMPOSITION_DIR: Final[Path] = BASE_DIR / 'Have you seen my body'
 SEASCAPE_TIMECUES: Final[dict[int, list[int]]] = {0: [198], 1: [332, 576], 2: [555]}
 SEASCAPE_IMGNAMES: Final[list[str]] = [
@@ -44,6 +46,7 @@ def create_scenario(
         'output': output,
         'has_visual': has_visual,
         'has_audio': has_audio,
+        'audio_output': output / AUDIO_EXPORT_NAME if has_audio else None,
     }
 
 
@@ -66,3 +69,11 @@ class Scenario(Enum):
 
     def __str__(self) -> str:
         return self.name.lower()
+
+    @property
+    def output_files(self) -> list[Path]:
+        output: Path = self.value['output']
+        files = [output / img_name for img_name in self.value['img_names']] if self.value['has_visual'] else []
+        if self.value['audio_output'] is not None:
+            files.append(self.value['audio_output'])
+        return files
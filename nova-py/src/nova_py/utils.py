@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+import os
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from tkinter import TclError
 from tkinter.filedialog import askdirectory
 from tkinter.messagebox import showerror
 from typing import TYPE_CHECKING, Final, NoReturn, Type
@@ -15,6 +18,19 @@ if TYPE_CHECKING:
 
 _LOGGER: Final = logging.getLogger(__name__)
 
+_ERROR_DIALOGS: bool = True
+
+IMG_EXTENSIONS: Final[frozenset[str]] = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.heic', '.webp'})
+AUDIO_EXTENSIONS: Final[frozenset[str]] = frozenset({'.m4a', '.mp3'})
+VIDEO_EXTENSIONS: Final[frozenset[str]] = frozenset({'.mov', '.mp4'})
+
+
+@dataclass(frozen=True)
+class InputFiles:
+    images: list[Path] = field(default_factory=list)
+    audio: list[Path] = field(default_factory=list)
+    videos: list[Path] = field(default_factory=list)
+
 
 def get_process(process_name: str) -> Process | None:
     for process in psutil.process_iter():
@@ -26,14 +42,31 @@ def get_process(process_name: str) -> Process | None:
     return None
 
 
-def get_files_by_extension(input_dir: Path, accepted_extensions: list[str]) -> list[Path]:
-    _LOGGER.info(f'Reading {accepted_extensions} files from {input_dir}.')
-    files = sorted(
-        [file_path for file_path in input_dir.iterdir() if file_path.suffix.lower() in accepted_extensions],
-        key=lambda x: x.name,
+def scan_input_dir(input_dir: Path) -> InputFiles:
+    """Classify the images, audio and video files of a directory in a single pass."""
+    _LOGGER.info(f'Scanning {input_dir}.')
+    images: list[Path] = []
+    audio: list[Path] = []
+    videos: list[Path] = []
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in IMG_EXTENSIONS:
+                images.append(Path(entry.path))
+            elif ext in AUDIO_EXTENSIONS:
+                audio.append(Path(entry.path))
+            elif ext in VIDEO_EXTENSIONS:
+                videos.append(Path(entry.path))
+
+    result = InputFiles(
+        images=sorted(images, key=lambda x: x.name),
+        audio=sorted(audio, key=lambda x: x.name),
+        videos=sorted(videos, key=lambda x: x.name),
     )
-    _LOGGER.debug(f'Found {len(files)} files: {files}.')
-    return files
+    _LOGGER.debug(f'Found {len(images)} images, {len(audio)} audio files and {len(videos)} videos.')
+    return result
 
 
 def check_file_path(path: Path) -> None:
@@ -56,8 +89,18 @@ def get_input_path() -> Path:
     return Path(f'{askdirectory(title="Visitor photos and voice recordings", mustexist=True)}')
 
 
+def set_error_dialogs(enabled: bool) -> None:
+    """Enable or disable the error dialog shown by `raise_error`, e.g. for unattended workers."""
+    global _ERROR_DIALOGS
+    _ERROR_DIALOGS = enabled
+
+
 def raise_error(error_class: Type[Exception], message: str) -> NoReturn:
-    showerror(title='Error', message=message)
+    if _ERROR_DIALOGS:
+        try:
+            showerror(title='Error', message=message)
+        except TclError as err:
+            _LOGGER.warning(f'Could not show error dialog: {err}')
     raise error_class(message)
 
 
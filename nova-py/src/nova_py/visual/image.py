@@ -4,39 +4,60 @@ import logging
 import os
 import platform
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 from PIL import Image  # type: ignore
 from pillow_heif import register_heif_opener  # type: ignore
 
-from ..utils import check_dir_path, get_files_by_extension, raise_error
+from ..utils import IMG_EXTENSIONS, check_dir_path, raise_error, scan_input_dir
+from .preview import CONTACT_SHEET_NAME, PREVIEW_DIR_NAME, write_contact_sheet, write_previews
+from .video import extract_sharpest_frames
+
+if TYPE_CHECKING:
+    from ..utils import InputFiles
 
 _LOGGER: Final = logging.getLogger(__name__)
 
 
 class VisualController:
-    IMG_EXTENSIONS: Final[list[str]] = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.heic', '.webp']
+    IMG_EXTENSIONS: Final[frozenset[str]] = IMG_EXTENSIONS
 
     def __init__(self) -> None:
         os_name = platform.system()
         _LOGGER.info(f'Operating system name: {os_name}')
 
-    def read_files(self, input_dir: Path, expected: int) -> None:
+    def read_files(self, input_dir: Path, expected: int, input_files: InputFiles | None = None) -> None:
         check_dir_path(input_dir)
-        self._files = get_files_by_extension(input_dir=input_dir, accepted_extensions=self.IMG_EXTENSIONS)
+        self._preview_dir = input_dir / PREVIEW_DIR_NAME
+        if input_files is None:
+            input_files = scan_input_dir(input_dir)
+        self._files = input_files.images if input_files.images else input_files.videos
+        self._sources: list[Path | Image.Image] = list(self._files)
+        if self.videos:
+            # a single clip holds every posture, otherwise each clip holds one
+            frames_per_clip = expected if len(self.videos) == 1 else 1
+            self._sources = [
+                frame
+                for video in self.videos
+                for frame in extract_sharpest_frames(video_path=video, count=frames_per_clip)
+            ]
         if (
-            len(self._files) != expected and len(self._files) != expected / 2
+            len(self._sources) != expected and len(self._sources) != expected / 2
         ):  # second condition only for walk #TODO: fix
             raise_error(error_class=ValueError, message='Error loading photos. Invalid number of files!')
 
     def process_files(self, img_names: list[str], output_dir: Path) -> None:
-        for i, file in enumerate(self._files):
+        thumbnails = []
+        for i, source in enumerate(self._sources):
             output_path = output_dir / img_names[i]
-            self.convert_file(image_path=file, output_path=output_path)
-        if len(self._files) == 3:  # second condition only for walk #TODO: fix
-            for i, file in enumerate(self._files):
+            image = self.convert_source(source=source, output_path=output_path)
+            thumbnail = write_previews(image=image, name=img_names[i], preview_dir=self._preview_dir)
+            thumbnails.append((img_names[i], thumbnail))
+        write_contact_sheet(thumbnails=thumbnails, output_path=self._preview_dir / CONTACT_SHEET_NAME)
+        if len(img_names) == 2 * len(self._sources):  # second condition only for walk #TODO: fix
+            for i, source in enumerate(self._sources):
                 output_path = output_dir / img_names[i + 3]
-                self.convert_file(image_path=file, output_path=output_path)
+                self.convert_source(source=source, output_path=output_path)
 
     @staticmethod
     def is_photo(file_path: Path) -> bool:
@@ -66,9 +87,22 @@ class VisualController:
     def heic_photos(self) -> list[Path]:
         return [file for file in self._files if self.is_heic_photo(file)]
 
-    @staticmethod
-    def convert_file(image_path: Path, output_path: Path) -> None:
+    @classmethod
+    def convert_source(cls, source: Path | Image.Image, output_path: Path) -> Image.Image:
+        if isinstance(source, Path):
+            return cls.convert_file(image_path=source, output_path=output_path)
+        _LOGGER.info(f'Converting video frame to {output_path}.')
+        return cls.convert_image(image=source, output_path=output_path)
+
+    @classmethod
+    def convert_file(cls, image_path: Path, output_path: Path) -> Image.Image:
         _LOGGER.info(f'Converting {image_path} to {output_path}.')
         register_heif_opener()
         image = Image.open(image_path)
-        image.convert('RGBA').save(output_path)
+        return cls.convert_image(image=image, output_path=output_path)
+
+    @staticmethod
+    def convert_image(image: Image.Image, output_path: Path) -> Image.Image:
+        converted = image.convert('RGBA')
+        converted.save(output_path)
+        return converted
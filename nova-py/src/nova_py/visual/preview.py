@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import html
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Final
+from urllib.parse import quote, unquote
+
+from PIL import Image, ImageDraw  # type: ignore
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+PREVIEW_DIR_NAME: Final = '.previews'
+PREVIEW_SIZES: Final[tuple[int, ...]] = (1024, 256)
+PREVIEW_QUALITY: Final = 80
+CONTACT_SHEET_NAME: Final = 'contact_sheet.jpg'
+CONTACT_SHEET_LABEL_HEIGHT: Final = 16
+PREVIEW_CACHE_BYTES: Final = 64 * 1024 * 1024
+PREVIEW_LISTING_SECONDS: Final = 10.0
+
+_CONTENT_TYPES: Final = {'.webp': 'image/webp', '.jpg': 'image/jpeg'}
+
+
+def preview_path(preview_dir: Path, name: str, size: int) -> Path:
+    return preview_dir / f'{Path(name).stem}_{size}.webp'
+
+
+def write_previews(image: Image.Image, name: str, preview_dir: Path) -> Image.Image:
+    """Write the preview pyramid of an already decoded image and return its smallest level.
+
+    Each level is downscaled from the previous one rather than from the full-size image.
+    """
+    preview_dir.mkdir(exist_ok=True)
+    level = image
+    for size in PREVIEW_SIZES:
+        level = level.copy()
+        level.thumbnail((size, size), reducing_gap=2.0)
+        level.save(preview_path(preview_dir=preview_dir, name=name, size=size), quality=PREVIEW_QUALITY, method=0)
+    _LOGGER.debug(f'Wrote {len(PREVIEW_SIZES)} previews of {name} to {preview_dir}.')
+    return level
+
+
+def write_contact_sheet(thumbnails: list[tuple[str, Image.Image]], output_path: Path) -> None:
+    cell = PREVIEW_SIZES[-1]
+    columns = math.ceil(math.sqrt(len(thumbnails)))
+    rows = math.ceil(len(thumbnails) / columns)
+    cell_height = cell + CONTACT_SHEET_LABEL_HEIGHT
+    sheet = Image.new('RGB', (columns * cell, rows * cell_height), color=(32, 32, 32))
+    draw = ImageDraw.Draw(sheet)
+    for i, (name, thumbnail) in enumerate(thumbnails):
+        x = (i % columns) * cell
+        y = (i // columns) * cell_height
+        offset = (x + (cell - thumbnail.width) // 2, y + (cell - thumbnail.height) // 2)
+        sheet.paste(thumbnail, offset, thumbnail if thumbnail.mode == 'RGBA' else None)
+        draw.text((x + 4, y + cell + 2), Path(name).stem, fill=(224, 224, 224))
+    sheet.save(output_path, quality=PREVIEW_QUALITY)
+    _LOGGER.info(f'Wrote contact sheet {output_path}.')
+
+
+class PreviewCache:
+    """Least recently used preview files, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int = PREVIEW_CACHE_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[Path, tuple[int, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def read(self, path: Path, mtime_ns: int) -> bytes:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime_ns:
+                self._entries.move_to_end(path)
+                return entry[1]
+        data = path.read_bytes()
+        with self._lock:
+            self._remove(path)
+            if len(data) <= self._max_bytes:
+                self._entries[path] = (mtime_ns, data)
+                self._size += len(data)
+            while self._size > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+        return data
+
+    def _remove(self, path: Path) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class VisitorListing:
+    """Names of the visitors with a contact sheet, listed again at most every ``max_age`` seconds.
+
+    Listing walks every visitor folder of the archive, which would otherwise be repeated on each
+    request to the index page.
+    """
+
+    def __init__(self, archive_dir: Path, max_age: float = PREVIEW_LISTING_SECONDS) -> None:
+        self._archive_dir = archive_dir
+        self._max_age = max_age
+        self._names: list[str] = []
+        self._listed_at: float | None = None
+        self._lock = threading.Lock()
+
+    def names(self) -> list[str]:
+        with self._lock:
+            now = time.monotonic()
+            if self._listed_at is None or now - self._listed_at >= self._max_age:
+                self._names = sorted(
+                    path.name
+                    for path in self._archive_dir.iterdir()
+                    if (path / PREVIEW_DIR_NAME / CONTACT_SHEET_NAME).is_file()
+                )
+                self._listed_at = now
+            return self._names
+
+
+class PreviewRequestHandler(BaseHTTPRequestHandler):
+    """Serve the previews of the visitor folders under ``archive_dir`` from an in-memory cache.
+
+    ``/`` lists the contact sheets, ``/<visitor>/`` lists the visitor's previews and
+    ``/<visitor>/<file>`` returns a file from the visitor's previews.
+    """
+
+    def __init__(
+        self, *args: object, archive_dir: Path, cache: PreviewCache, listing: VisitorListing, **kwargs: object
+    ) -> None:
+        self._archive_dir = archive_dir
+        self._cache = cache
+        self._listing = listing
+        super().__init__(*args, **kwargs)  # type: ignore
+
+    def do_GET(self) -> None:
+        parts = [unquote(part) for part in self.path.split('?', 1)[0].split('/') if part]
+        if not parts:
+            self._send(HTTPStatus.OK, 'text/html; charset=utf-8', self._index().encode())
+            return
+        if len(parts) == 1:
+            page = self._visitor_page(parts[0])
+            if page is None:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            self._send(HTTPStatus.OK, 'text/html; charset=utf-8', page.encode())
+            return
+        path = self._preview_path(parts)
+        content_type = _CONTENT_TYPES.get(path.suffix.lower()) if path is not None else None
+        if path is None or content_type is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        try:
+            body = self._cache.read(path, path.stat().st_mtime_ns)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        self._send(HTTPStatus.OK, content_type, body)
+
+    def _preview_dir(self, visitor: str) -> Path | None:
+        preview_dir = (self._archive_dir / visitor / PREVIEW_DIR_NAME).resolve()
+        # drive names, absolute parts and '..' could otherwise escape the archive
+        return preview_dir if preview_dir.is_relative_to(self._archive_dir) else None
+
+    def _preview_path(self, parts: list[str]) -> Path | None:
+        preview_dir = self._preview_dir(parts[0]) if len(parts) == 2 else None
+        if preview_dir is None:
+            return None
+        path = (preview_dir / parts[1]).resolve()
+        return path if path.parent == preview_dir else None
+
+    def _index(self) -> str:
+        links = ''.join(
+            f'<a href="/{quote(name)}/"><figure><img src="/{quote(name)}/{CONTACT_SHEET_NAME}"'
+            f' loading="lazy" width="256"><figcaption>{html.escape(name)}</figcaption></figure></a>'
+            for name in self._listing.names()
+        )
+        return _page(title='NOVA previews', body=links)
+
+    def _visitor_page(self, visitor: str) -> str | None:
+        preview_dir = self._preview_dir(visitor)
+        if preview_dir is None or not preview_dir.is_dir():
+            return None
+        thumbnail_suffix = f'_{PREVIEW_SIZES[-1]}.webp'
+        url = f'/{quote(visitor)}'
+        links = ''
+        for path in sorted(preview_dir.glob(f'*{thumbnail_suffix}')):
+            stem = path.name.removesuffix(thumbnail_suffix)
+            large = quote(f'{stem}_{PREVIEW_SIZES[0]}.webp')
+            links += (
+                f'<a href="{url}/{large}"><figure><img src="{url}/{quote(path.name)}" loading="lazy">'
+                f'<figcaption>{html.escape(stem)}</figcaption></figure></a>'
+            )
+        return _page(title=visitor, body=f'<h1><a href="/">NOVA previews</a> / {html.escape(visitor)}</h1>{links}')
+
+    def _send(self, status: HTTPStatus, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        _LOGGER.debug(format % args)
+
+
+def _page(title: str, body: str) -> str:
+    return f'<!DOCTYPE html><html><head><title>{html.escape(title)}</title></head><body>{body}</body></html>'
+
+
+def create_preview_server(archive_dir: Path, host: str, port: int) -> ThreadingHTTPServer:
+    archive_dir = archive_dir.resolve()
+    handler = partial(
+        PreviewRequestHandler, archive_dir=archive_dir, cache=PreviewCache(), listing=VisitorListing(archive_dir)
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve_previews(archive_dir: Path, host: str, port: int) -> None:
+    with create_preview_server(archive_dir=archive_dir, host=host, port=port) as server:
+        _LOGGER.info(f'Serving previews of {archive_dir} on http://{host}:{server.server_port}/')
+        server.serve_forever()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+import av
+import numpy as np
+
+if TYPE_CHECKING:
+    from PIL import Image  # type: ignore
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+FRAME_WINDOW: Final = 16
+SCORING_WIDTH: Final = 320
+
+
+def laplacian_variance(frames: np.ndarray) -> np.ndarray:
+    """Score the sharpness of each grayscale frame in a ``(N, H, W)`` stack by the variance of its Laplacian."""
+    f = frames.astype(np.float32)
+    laplacian = f[:, 1:-1, :-2] + f[:, 1:-1, 2:] + f[:, :-2, 1:-1] + f[:, 2:, 1:-1] - 4 * f[:, 1:-1, 1:-1]
+    return laplacian.reshape(len(f), -1).var(axis=1)
+
+
+def extract_sharpest_frames(video_path: Path, count: int, window: int = FRAME_WINDOW) -> list[Image.Image]:
+    """Split a clip into ``count`` equal segments and return the sharpest frame of each.
+
+    Frames are decoded as a stream and scored in batches of at most ``window`` downscaled grayscale
+    frames, so memory use does not grow with the length of the clip.
+    """
+    _LOGGER.info(f'Extracting {count} frames from {video_path}.')
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = 'AUTO'
+        duration = _duration(container, stream)
+        start = 0.0
+        if stream.start_time is not None and stream.time_base is not None:
+            start = float(stream.start_time * stream.time_base)
+        scoring_height = max(3, round(stream.height * SCORING_WIDTH / stream.width))
+
+        best_scores = [-1.0] * count
+        best_frames: list[Any] = [None] * count
+        batch: list[np.ndarray] = []
+        batch_frames: list[tuple[int, Any]] = []
+
+        def score_batch() -> None:
+            scores = laplacian_variance(np.stack(batch))
+            for score, (segment, frame) in zip(scores, batch_frames):
+                if score > best_scores[segment]:
+                    best_scores[segment] = float(score)
+                    best_frames[segment] = frame
+            batch.clear()
+            batch_frames.clear()
+
+        for frame in container.decode(stream):
+            timestamp = frame.time - start if frame.time is not None else 0.0
+            segment = min(max(int(timestamp / duration * count), 0), count - 1) if duration > 0 else 0
+            gray = frame.reformat(width=SCORING_WIDTH, height=scoring_height, format='gray').to_ndarray()
+            batch.append(gray)
+            batch_frames.append((segment, frame))
+            if len(batch) == window:
+                score_batch()
+        if batch:
+            score_batch()
+
+    if any(frame is None for frame in best_frames):
+        raise ValueError(f'Video is too short to extract {count} frames: {video_path}')
+    _LOGGER.debug(f'Sharpness of the selected frames: {best_scores}')
+    return [_to_upright_image(frame) for frame in best_frames]
+
+
+def _to_upright_image(frame: Any) -> Image.Image:
+    # phone clips are stored landscape with a display matrix that rotates them counterclockwise by `rotation` degrees
+    image = frame.to_image()
+    if frame.rotation:
+        image = image.rotate(frame.rotation, expand=True)
+    return image
+
+
+def _duration(container: Any, stream: Any) -> float:
+    if stream.duration is not None and stream.time_base is not None:
+        return float(stream.duration * stream.time_base)
+    if container.duration is not None:
+        return container.duration / av.time_base
+    return 0.0
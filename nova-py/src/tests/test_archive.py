@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from nova_py.archive import ArchiveIndex, FileKind, VisitorStatus
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def touch_later(path: Path) -> None:
+    """Create or modify ``path`` and move its parent's mtime forward, whatever the filesystem resolution."""
+    path.write_bytes(path.read_bytes() + b'x' if path.exists() else b'x')
+    stat = path.parent.stat()
+    os.utime(path.parent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def statuses(index: ArchiveIndex) -> dict[str, VisitorStatus]:
+    return {visitor.path.name: visitor.status for visitor in index.visitors()}
+
+
+def test_sync_indexes_media_files(tmp_path: Path) -> None:
+    visitor = tmp_path / 'visitor'
+    visitor.mkdir()
+    for name in ('a.jpg', 'b.m4a', 'c.mov', 'notes.txt'):
+        (visitor / name).write_bytes(b'x')
+
+    with ArchiveIndex(db_path=tmp_path / 'index.db') as index:
+        assert index.sync(archive_dir=tmp_path) == 1
+        assert index.sync(archive_dir=tmp_path) == 0
+        files = index.files(visitor_dir=visitor)
+
+    assert [(file.path.name, file.kind) for file in files] == [
+        ('a.jpg', FileKind.IMAGE),
+        ('b.m4a', FileKind.AUDIO),
+        ('c.mov', FileKind.VIDEO),
+    ]
+
+
+def test_new_media_resets_status(tmp_path: Path) -> None:
+    visitor = tmp_path / 'visitor'
+    visitor.mkdir()
+    (visitor / 'a.jpg').write_bytes(b'x')
+
+    with ArchiveIndex(db_path=tmp_path / 'index.db') as index:
+        index.sync(archive_dir=tmp_path)
+        index.set_status(visitor_dir=visitor, status=VisitorStatus.DONE)
+
+        (visitor / '.previews').mkdir()
+        touch_later(visitor / '.previews' / 'a_256.webp')
+        index.sync(archive_dir=tmp_path)
+        assert statuses(index) == {'visitor': VisitorStatus.DONE}
+
+        touch_later(visitor / 'b.jpg')
+        index.sync(archive_dir=tmp_path)
+        assert statuses(index) == {'visitor': VisitorStatus.PENDING}
+
+
+def test_visitor_processed_before_first_sync_keeps_status(tmp_path: Path) -> None:
+    visitor = tmp_path / 'visitor'
+    visitor.mkdir()
+    (visitor / 'a.jpg').write_bytes(b'x')
+
+    with ArchiveIndex(db_path=tmp_path / 'index.db') as index:
+        index.set_status(visitor_dir=visitor, status=VisitorStatus.PROCESSING)
+        (visitor / '.previews').mkdir()
+        touch_later(visitor / '.previews' / 'a_256.webp')
+        index.set_status(visitor_dir=visitor, status=VisitorStatus.DONE)
+
+        index.sync(archive_dir=tmp_path)
+        assert statuses(index) == {'visitor': VisitorStatus.DONE}
+        assert [file.path.name for file in index.files(visitor_dir=visitor)] == ['a.jpg']
+
+
+def test_sync_keeps_visitors_outside_archive(tmp_path: Path) -> None:
+    archive = tmp_path / 'archive'
+    (archive / 'gone').mkdir(parents=True)
+    elsewhere = tmp_path / 'elsewhere'
+    elsewhere.mkdir()
+
+    with ArchiveIndex(db_path=tmp_path / 'index.db') as index:
+        index.sync(archive_dir=archive)
+        index.set_status(visitor_dir=elsewhere, status=VisitorStatus.DONE)
+        (archive / 'gone').rmdir()
+        index.sync(archive_dir=archive)
+
+        assert statuses(index) == {'elsewhere': VisitorStatus.DONE}
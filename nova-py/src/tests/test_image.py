@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from PIL import Image
+
+from nova_py.visual.image import VisualController
+from nova_py.visual.preview import CONTACT_SHEET_NAME, PREVIEW_DIR_NAME
+
+from .test_video import HEIGHT, RATE, WIDTH, noise, write_clip
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def output_dir(tmp_path: Path) -> Path:
+    path = tmp_path / 'output'
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def input_dir(tmp_path: Path) -> Path:
+    path = tmp_path / 'visitor'
+    path.mkdir()
+    return path
+
+
+def write_clips(input_dir: Path, count: int) -> None:
+    for i in range(count):
+        write_clip(input_dir / f'clip_{i}.mp4', [noise(RATE * i + j, 0, 256) for j in range(RATE)])
+
+
+def process(input_dir: Path, output_dir: Path, expected: int) -> list[str]:
+    img_names = [f'pose_{i}.png' for i in range(expected)]
+    controller = VisualController()
+    controller.read_files(input_dir=input_dir, expected=expected)
+    controller.process_files(img_names=img_names, output_dir=output_dir)
+    assert (input_dir / PREVIEW_DIR_NAME / CONTACT_SHEET_NAME).is_file()
+    return sorted(path.name for path in output_dir.iterdir())
+
+
+def test_single_clip_gives_every_frame(input_dir: Path, output_dir: Path) -> None:
+    write_clip(input_dir / 'clip.mov', [noise(i, 0, 256) for i in range(2 * RATE)])
+
+    assert process(input_dir=input_dir, output_dir=output_dir, expected=4) == [f'pose_{i}.png' for i in range(4)]
+    with Image.open(output_dir / 'pose_0.png') as image:
+        assert image.size == (WIDTH, HEIGHT)
+
+
+def test_several_clips_give_one_frame_each(input_dir: Path, output_dir: Path) -> None:
+    write_clips(input_dir=input_dir, count=3)
+
+    assert process(input_dir=input_dir, output_dir=output_dir, expected=3) == [f'pose_{i}.png' for i in range(3)]
+
+
+def test_images_win_over_videos(input_dir: Path, output_dir: Path) -> None:
+    write_clips(input_dir=input_dir, count=1)
+    for i in range(2):
+        noise(i, 0, 256).crop((0, 0, 32, 32)).save(input_dir / f'photo_{i}.png')
+
+    assert process(input_dir=input_dir, output_dir=output_dir, expected=2) == ['pose_0.png', 'pose_1.png']
+
+    for i in range(2):
+        with Image.open(output_dir / f'pose_{i}.png') as image:
+            assert image.size == (32, 32)
+
+
+def test_walk_duplicates_three_clips(input_dir: Path, output_dir: Path) -> None:
+    write_clips(input_dir=input_dir, count=3)
+
+    assert process(input_dir=input_dir, output_dir=output_dir, expected=6) == [f'pose_{i}.png' for i in range(6)]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from nova_py import jobs
+from nova_py.jobs import JOB_OUTPUT_DIR_NAME, Job, JobQueue, JobState, JobWorker
+from nova_py.scenario import Scenario
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+LEASE = 60
+RETRY_DELAY = 30.0
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(jobs.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path: Path, clock: Clock) -> JobQueue:
+    return JobQueue(db_path=tmp_path / 'queue.db', lease_seconds=LEASE, max_attempts=2, retry_delay=RETRY_DELAY)
+
+
+def state(queue: JobQueue, job_id: int) -> JobState:
+    with sqlite3.connect(queue._db_path) as conn:
+        (value,) = conn.execute('SELECT state FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return JobState(value)
+
+
+def test_claim_and_complete(queue: JobQueue, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+
+    job = queue.claim(worker_id='w1', node='n1')
+
+    assert job == Job(
+        id=job_id,
+        scenario=Scenario.WALK,
+        input_dir=tmp_path.resolve(),
+        output_dir=tmp_path.resolve() / JOB_OUTPUT_DIR_NAME,
+        attempts=1,
+    )
+    assert queue.claim(worker_id='w2', node='n2') is None
+    queue.complete(job_id=job_id, worker_id='w1')
+    assert state(queue, job_id) == JobState.DONE
+
+
+def test_failed_job_waits_for_retry_delay(queue: JobQueue, clock: Clock, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    assert queue.claim(worker_id='w1', node='n1') is not None
+
+    queue.fail(job_id=job_id, worker_id='w1', error='boom')
+
+    assert state(queue, job_id) == JobState.PENDING
+    assert queue.claim(worker_id='w1', node='n1') is None
+    clock.now += RETRY_DELAY
+    job = queue.claim(worker_id='w1', node='n1')
+    assert job is not None
+    assert job.attempts == 2
+
+
+def test_job_fails_after_max_attempts(queue: JobQueue, clock: Clock, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    for _ in range(2):
+        assert queue.claim(worker_id='w1', node='n1') is not None
+        queue.fail(job_id=job_id, worker_id='w1', error='boom')
+        clock.now += 10 * RETRY_DELAY
+
+    assert state(queue, job_id) == JobState.FAILED
+    assert queue.claim(worker_id='w1', node='n1') is None
+
+
+def test_heartbeat_extends_lease(queue: JobQueue, clock: Clock, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    assert queue.claim(worker_id='w1', node='n1') is not None
+
+    clock.now += LEASE - 1
+    assert queue.heartbeat(job_id=job_id, worker_id='w1')
+    clock.now += LEASE - 1
+
+    assert queue.claim(worker_id='w2', node='n2') is None
+
+
+def test_expired_lease_is_reclaimed(queue: JobQueue, clock: Clock, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    assert queue.claim(worker_id='w1', node='n1') is not None
+
+    clock.now += LEASE + 1
+    assert queue.stats().depth == 1
+    job = queue.claim(worker_id='w2', node='n2')
+
+    assert job is not None
+    assert job.attempts == 2
+    assert not queue.heartbeat(job_id=job_id, worker_id='w1')
+    queue.complete(job_id=job_id, worker_id='w1')
+    assert state(queue, job_id) == JobState.RUNNING
+
+
+def test_expired_lease_on_last_attempt_fails_job(queue: JobQueue, clock: Clock, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    for worker in ('w1', 'w2'):
+        assert queue.claim(worker_id=worker, node=worker) is not None
+        clock.now += LEASE + 1
+
+    assert queue.claim(worker_id='w3', node='n3') is None
+    assert state(queue, job_id) == JobState.FAILED
+
+
+def test_node_runs_one_job_at_a_time(queue: JobQueue, tmp_path: Path) -> None:
+    queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    assert queue.claim(worker_id='w1', node='n1') is not None
+
+    assert queue.claim(worker_id='w2', node='n1') is None
+    assert queue.claim(worker_id='w3', node='n2') is not None
+
+
+def test_worker_reports_results(queue: JobQueue, tmp_path: Path) -> None:
+    ok_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+    bad_id = queue.enqueue(scenario=Scenario.SEASCAPE, input_dir=tmp_path)
+    processed: list[int] = []
+
+    def process(job: Job) -> None:
+        processed.append(job.id)
+        if job.scenario is Scenario.SEASCAPE:
+            raise ValueError('Invalid number of files!')
+
+    worker = JobWorker(queue=queue, process=process, worker_id='w1', node='n1', poll_interval=0)
+    assert worker.run(max_jobs=2) == 2
+
+    assert processed == [ok_id, bad_id]
+    assert state(queue, ok_id) == JobState.DONE
+    assert state(queue, bad_id) == JobState.PENDING
+    stats = queue.stats()
+    assert (stats.depth, stats.done, stats.running) == (1, 1, 0)
+
+
+def test_worker_fails_job_after_timeout(queue: JobQueue, tmp_path: Path) -> None:
+    job_id = queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+
+    worker = JobWorker(
+        queue=queue, process=lambda job: time.sleep(0.5), worker_id='w1', node='n1', poll_interval=0, job_timeout=0.1
+    )
+    assert worker.run(max_jobs=1) == 1
+
+    assert state(queue, job_id) == JobState.PENDING
+    with sqlite3.connect(queue._db_path) as conn:
+        (error,) = conn.execute('SELECT error FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    assert error == 'Timed out after 0.1s'
+
+
+def test_stats_do_not_wait_for_writers(queue: JobQueue, tmp_path: Path) -> None:
+    queue.enqueue(scenario=Scenario.WALK, input_dir=tmp_path)
+
+    with sqlite3.connect(queue._db_path, isolation_level=None) as writer:
+        writer.execute('BEGIN IMMEDIATE')
+        assert queue.stats().pending == 1
+        writer.execute('ROLLBACK')
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from PIL import Image
+
+from nova_py.visual.preview import (
+    CONTACT_SHEET_NAME,
+    PREVIEW_DIR_NAME,
+    PREVIEW_SIZES,
+    PreviewCache,
+    VisitorListing,
+    create_preview_server,
+    preview_path,
+    write_contact_sheet,
+    write_previews,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def test_write_previews(tmp_path: Path) -> None:
+    image = Image.new('RGBA', (3000, 2000), color=(255, 0, 0, 255))
+
+    thumbnail = write_previews(image=image, name='user_frontal.png', preview_dir=tmp_path)
+
+    assert thumbnail.size == (256, 171)
+    for size in PREVIEW_SIZES:
+        with Image.open(preview_path(preview_dir=tmp_path, name='user_frontal.png', size=size)) as preview:
+            assert max(preview.size) == size
+
+
+def test_write_contact_sheet(tmp_path: Path) -> None:
+    thumbnails = [(f'{i}.png', Image.new('RGBA', (256, 128))) for i in range(5)]
+
+    write_contact_sheet(thumbnails=thumbnails, output_path=tmp_path / CONTACT_SHEET_NAME)
+
+    with Image.open(tmp_path / CONTACT_SHEET_NAME) as sheet:
+        assert sheet.width == 3 * 256
+        assert sheet.height > 2 * 256
+
+
+def test_preview_cache_is_bounded(tmp_path: Path) -> None:
+    cache = PreviewCache(max_bytes=250)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'{i}.webp'
+        path.write_bytes(bytes(100))
+        paths.append(path)
+
+    for path in paths:
+        assert cache.read(path, mtime_ns=0) == bytes(100)
+    assert cache.size == 200
+
+    paths[2].write_bytes(bytes(50))
+    assert cache.read(paths[2], mtime_ns=1) == bytes(50)
+    assert cache.size == 150
+
+
+@pytest.fixture
+def archive_url(tmp_path: Path) -> Iterator[str]:
+    archive = tmp_path / 'archive'
+    previews = archive / 'visitor' / PREVIEW_DIR_NAME
+    previews.mkdir(parents=True)
+    (previews / CONTACT_SHEET_NAME).write_bytes(b'sheet')
+    for size in PREVIEW_SIZES:
+        (previews / f'user_side_{size}.webp').write_bytes(b'preview')
+    (archive / 'unprocessed').mkdir()
+    (tmp_path / PREVIEW_DIR_NAME).mkdir()
+    (tmp_path / PREVIEW_DIR_NAME / 'secret.jpg').write_bytes(b'secret')
+
+    server = create_preview_server(archive_dir=archive, host='127.0.0.1', port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_visitor_listing_is_refreshed_after_max_age(tmp_path: Path) -> None:
+    listing = VisitorListing(archive_dir=tmp_path, max_age=3600)
+    assert listing.names() == []
+
+    (tmp_path / 'visitor' / PREVIEW_DIR_NAME).mkdir(parents=True)
+    (tmp_path / 'visitor' / PREVIEW_DIR_NAME / CONTACT_SHEET_NAME).write_bytes(b'sheet')
+    assert listing.names() == []
+    assert VisitorListing(archive_dir=tmp_path, max_age=0).names() == ['visitor']
+
+
+def test_server_serves_previews(archive_url: str) -> None:
+    with urlopen(f'{archive_url}/') as response:
+        page = response.read().decode()
+    assert 'href="/visitor/"' in page
+    assert f'src="/visitor/{CONTACT_SHEET_NAME}"' in page
+    assert 'unprocessed' not in page
+    with urlopen(f'{archive_url}/visitor/') as response:
+        page = response.read().decode()
+    assert 'href="/visitor/user_side_1024.webp"' in page
+    assert 'src="/visitor/user_side_256.webp"' in page
+    with urlopen(f'{archive_url}/visitor/{CONTACT_SHEET_NAME}') as response:
+        assert response.headers['Content-Type'] == 'image/jpeg'
+        assert response.read() == b'sheet'
+
+
+@pytest.mark.parametrize(
+    'path',
+    [
+        '/visitor/missing.webp',
+        '/unprocessed/',
+        '/missing/',
+        '/../secret.jpg',
+        '/..',
+        '/%2E%2E/secret.jpg',
+        '/visitor/..%2F..%2Fsecret.jpg',
+    ],
+)
+def test_server_rejects_paths_outside_previews(archive_url: str, path: str) -> None:
+    with pytest.raises(HTTPError) as error:
+        urlopen(archive_url + path)
+    assert error.value.code == 404
+
+
+def test_server_rejects_absolute_visitor(archive_url: str, tmp_path: Path) -> None:
+    # the POSIX counterpart of a 'C:' drive name, which would replace the archive root
+    with pytest.raises(HTTPError) as error:
+        urlopen(f'{archive_url}/{str(tmp_path).replace("/", "%2F")}/secret.jpg')
+    assert error.value.code == 404
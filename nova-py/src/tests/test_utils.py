@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from tkinter import TclError
+from typing import TYPE_CHECKING
+
+import pytest
+
+from nova_py import utils
+from nova_py.utils import raise_error, scan_input_dir, set_error_dialogs
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_raise_error_without_dialog(monkeypatch: pytest.MonkeyPatch) -> None:
+    def showerror(title: str, message: str) -> None:
+        raise AssertionError('dialog shown')
+
+    monkeypatch.setattr(utils, 'showerror', showerror)
+    set_error_dialogs(False)
+    try:
+        with pytest.raises(ValueError, match='Invalid number of files'):
+            raise_error(error_class=ValueError, message='Invalid number of files!')
+    finally:
+        set_error_dialogs(True)
+
+
+def test_raise_error_keeps_error_when_dialog_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    def showerror(title: str, message: str) -> None:
+        raise TclError('no display name and no $DISPLAY environment variable')
+
+    monkeypatch.setattr(utils, 'showerror', showerror)
+    with pytest.raises(ValueError, match='Directory does not exist'):
+        raise_error(error_class=ValueError, message='Directory does not exist: /missing')
+
+
+def test_scan_input_dir(tmp_path: Path) -> None:
+    for name in ('c.png', 'B.JPG', 'a.jpeg', 'voice.Mp3', 'other.M4A', 'clip.MOV', 'notes.txt'):
+        (tmp_path / name).write_bytes(b'x')
+    (tmp_path / 'folder.jpg').mkdir()
+
+    input_files = scan_input_dir(tmp_path)
+
+    assert [path.name for path in input_files.images] == ['B.JPG', 'a.jpeg', 'c.png']
+    assert [path.name for path in input_files.audio] == ['other.M4A', 'voice.Mp3']
+    assert [path.name for path in input_files.videos] == ['clip.MOV']
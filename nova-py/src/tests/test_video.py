@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+import av
+import numpy as np
+from PIL import Image, ImageFilter
+
+from nova_py.visual.video import extract_sharpest_frames, laplacian_variance
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+WIDTH = 160
+HEIGHT = 96
+RATE = 10
+
+
+def write_clip(path: Path, frames: list[Image.Image]) -> None:
+    with av.open(str(path), 'w') as container:
+        stream = container.add_stream('libx264', rate=RATE)
+        stream.width = frames[0].width
+        stream.height = frames[0].height
+        stream.pix_fmt = 'yuv420p'
+        for image in frames:
+            container.mux(stream.encode(av.VideoFrame.from_image(image)))
+        container.mux(stream.encode())
+
+
+def set_display_rotation_90(path: Path) -> None:
+    """Store the QuickTime track matrix of a phone clip meant to be shown rotated 90 degrees clockwise."""
+    data = bytearray(path.read_bytes())
+    tkhd = data.index(b'tkhd')
+    assert data[tkhd + 4] == 0
+    matrix = tkhd + 4 + 4 + 12 + 4 + 4 + 8 + 8
+    struct.pack_into('>9I', data, matrix, 0, 0x10000, 0, 0xFFFF0000, 0, 0, 0, 0, 0x40000000)
+    path.write_bytes(data)
+
+
+def noise(seed: int, low: int, high: int) -> Image.Image:
+    pixels = np.random.default_rng(seed).integers(low, high, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def test_laplacian_variance_ranks_sharp_above_blurred() -> None:
+    sharp = np.asarray(noise(0, 0, 256).convert('L'))
+    blurred = np.asarray(noise(0, 0, 256).convert('L').filter(ImageFilter.GaussianBlur(3)))
+    flat = np.full((HEIGHT, WIDTH), 128, dtype=np.uint8)
+
+    scores = laplacian_variance(np.stack([blurred, sharp, flat]))
+
+    assert scores.shape == (3,)
+    assert scores[1] > scores[0] > scores[2]
+    assert scores[2] == 0
+
+
+def test_extract_sharpest_frames_picks_sharp_frame_per_segment(tmp_path: Path) -> None:
+    # every second of the clip is one segment; only its sixth frame is sharp, and it is darker than the blurred ones
+    frames = [
+        noise(i, 0, 128) if i % RATE == 5 else noise(i, 128, 256).filter(ImageFilter.GaussianBlur(3))
+        for i in range(3 * RATE)
+    ]
+    clip = tmp_path / 'clip.mp4'
+    write_clip(clip, frames)
+
+    images = extract_sharpest_frames(video_path=clip, count=3, window=4)
+
+    assert len(images) == 3
+    for image in images:
+        assert image.size == (WIDTH, HEIGHT)
+        assert np.asarray(image.convert('L')).mean() < 100
+
+
+def test_extract_sharpest_frames_applies_display_rotation(tmp_path: Path) -> None:
+    # landscape frames whose left half is white come out portrait with the white half on top
+    pixels = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    pixels[:, : WIDTH // 2] = 255
+    clip = tmp_path / 'portrait.mp4'
+    write_clip(clip, [Image.fromarray(pixels)] * RATE)
+    set_display_rotation_90(clip)
+
+    (image,) = extract_sharpest_frames(video_path=clip, count=1)
+
+    assert image.size == (HEIGHT, WIDTH)
+    gray = np.asarray(image.convert('L'))
+    assert gray[: WIDTH // 2 - 8].mean() > 200
+    assert gray[WIDTH // 2 + 8 :].mean() < 50